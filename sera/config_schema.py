@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any, Literal
 from omegaconf import MISSING
 
-@dataclass
+@dataclass(slots=True)
 class SWEAgentWrapperConfig:
     """
     Wrapper for adjusting SWE agent settings. Suggest directly modifying in sera/configs/sweagent for more options.
@@ -22,7 +22,7 @@ class SWEAgentWrapperConfig:
     # Model temperature
     temperature: float = 0.6
 
-@dataclass
+@dataclass(slots=True)
 class ModelConfig:
     """Configuration for a single model endpoint."""
     # Model name. Use openai/ as a prefix for local and openai models. anthropic/ prefix for anthropic models.
@@ -30,7 +30,7 @@ class ModelConfig:
     # Model URL. Leave empty for openai or anthropic API models.
     url: Optional[str] = ""
 
-@dataclass
+@dataclass(slots=True)
 class DockerConfig:
     """Configuration for container creation for personal repositories"""
     # Docker org to push created images to
@@ -38,7 +38,7 @@ class DockerConfig:
     # Mirror organization for Github. 
     gh_mirror_org: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class PersonalRepoConfig:
     """Args for generating data from personal repositories"""
     # Github repo org
@@ -70,7 +70,7 @@ class PersonalRepoConfig:
     # How deep to parse into the codebase from `top_level_folder`. Higher number = more functions extracted.
     max_folder_depth: int = 3
 
-@dataclass
+@dataclass(slots=True)
 class ExistingRepoConfig:
     """Args for generating data from repositories with Docker containers already (swesmith, swebench, etc.)"""
     # Github repo org
@@ -95,7 +95,7 @@ class ExistingRepoConfig:
 
 #############
 
-@dataclass
+@dataclass(slots=True)
 class GenerateConfig:
     """Configuration for data generation."""
     default: Dict[str, str] = field(default_factory=lambda: {"repo_domain": "github.com"})
@@ -111,7 +111,7 @@ class GenerateConfig:
     # Args for container creation
     docker: DockerConfig = field(default_factory=DockerConfig)
 
-@dataclass
+@dataclass(slots=True)
 class DistillConfig:
     """Configuration for distillation process."""
     # Model config
@@ -129,12 +129,12 @@ class DistillConfig:
     # Sweagent config for rollout two to use. Should be included in SeraConfig.sweagent_cfgs
     stage_two_config_name: str = "e2e"
 
-@dataclass
+@dataclass(slots=True)
 class EvalConfig:
     # Soft verification threshold. 1 for hard-verify. 1 > r > 0 for soft-verify. 0 for no verify.
     compare_patch_threshold: float = 1
 
-@dataclass
+@dataclass(slots=True)
 class PostprocessConfig: # Postprocessing
     """Configuration for data formatting."""
     # Tool call format. Choose hermes or xml.
@@ -150,7 +150,7 @@ class PostprocessConfig: # Postprocessing
     # Only process trajectories that submit, ignoring ones that hit cost limits, context limits, etc.
     enforce_submit: bool = True
 
-@dataclass
+@dataclass(slots=True)
 class SeraConfig:
     """Main configuration object for SERA datagen system."""
     # What stage to run
@@ -27,9 +27,14 @@ import argparse
 import json
 import logging
 import os
+import re
 
-from tqdm import tqdm
-from transformers import AutoTokenizer
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -37,6 +42,24 @@ logger = logging.getLogger(__name__)
 PATCH_EDIT_MAX = 40
 TOOL_CALL_TOKEN_MAX = 600
 
+def loads(line):
+    # orjson parses at C level, ~2-5x faster on large JSONL files
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+_INSTANCE_ID_RE = re.compile(rb'"instance_id"\s*:\s*"([^"]+)"')
+
+def extract_instance_id(line: bytes) -> str:
+    # Quotes inside JSON string values are always escaped, so an unescaped
+    # "instance_id" key can only occur structurally; this skips parsing the
+    # (much larger) rest of the record. Fall back to a full parse if the
+    # pattern misses. Assumes the first structural match is the top-level key:
+    # a nested object carrying its own instance_id key earlier in the record
+    # would bind wrong, which the per-file cross-check in main() detects.
+    m = _INSTANCE_ID_RE.search(line)
+    if m:
+        return m.group(1).decode()
+    return loads(line)["instance_id"]
+
 def get_args():
     parser = argparse.ArgumentParser()
     parser.add_argument('-d', '--dataset', nargs="+")
@@ -45,58 +68,45 @@ def get_args():
     return parser.parse_args()
 
 def analyze_diff(patch_text: str):
-    added = 0
-    deleted = 0
-    new_files = 0
-
-    current_file_is_new = False
-
-    for line in patch_text.splitlines():
-
-        # Detect entering a new file diff block
-        if line.startswith("diff --git"):
-            # Reset for new file
-            current_file_is_new = False
-
-        # Detect new files (git diff marks them like this)
-        if line.startswith("new file mode"):
-            current_file_is_new = True
-            new_files += 1
-
-        # Count added / removed lines
-        # Skip diff metadata lines
-        if line.startswith('+++') or line.startswith('---') or line.startswith('diff --git') or line.startswith('@@'):
-            continue
-
-        # Added lines (but not "+++" metadata)
-        if line.startswith('+') and not line.startswith('+++'):
-            added += 1
-
-        # Removed lines (but not "---" metadata)
-        if line.startswith('-') and not line.startswith('---'):
-            deleted += 1
-
+    # Count line prefixes with bulk bytes.count calls (memchr-backed in CPython)
+    # instead of a per-line Python loop with startswith checks. A leading "\n"
+    # lets the first line of the patch match too. "+++"/"---" metadata lines
+    # also match "\n+"/"\n-", so subtract them back out.
+    b = ("\n" + patch_text).encode()
     return {
-        "added_lines": added,
-        "deleted_lines": deleted,
-        "new_files": new_files
+        "added_lines": b.count(b"\n+") - b.count(b"\n+++"),
+        "deleted_lines": b.count(b"\n-") - b.count(b"\n---"),
+        "new_files": b.count(b"\nnew file mode")
     }
 
-def count_tokens(tokenizer, text: str) -> int:
-    return len(tokenizer.encode(text, add_special_tokens=False))
-
 def main():
+    # Deferred so long_edit runs never pay the transformers/torch import cost
+    from tqdm import tqdm
+
     args = get_args()
     remove_ids = set()
 
     logger.info("Loading datasets...")
-    loaded_dataset = []
+    # Keep the raw serialized lines and only pull out instance_id up front;
+    # long_edit never needs the rest of the record, and the write pass can
+    # emit the original lines unchanged
+    raw_lines = []
+    instance_ids = []
     for data_fp in args.dataset:
         logger.info(f"Loading: {data_fp}")
-        with open(data_fp, "r") as f:
-            loaded_dataset += [json.loads(line) for line in f.readlines()]
-    dataset_ids = set([d["instance_id"] for d in loaded_dataset])
-    logger.info(f"Loaded {len(loaded_dataset)} instances from {len(args.dataset)} file(s)")
+        with open(data_fp, "rb") as f:
+            file_lines = [line if line.endswith(b"\n") else line + b"\n" for line in f]
+        file_ids = [extract_instance_id(line) for line in file_lines]
+        # Cross-check one fully parsed sample per file; if a nested
+        # instance_id key made the fast path bind the wrong id, reparse
+        # the whole file instead of silently mis-filtering it
+        if file_lines and file_ids[0] != loads(file_lines[0])["instance_id"]:
+            logger.warning(f"Fast instance_id extraction disagrees with parsed record in {data_fp}, reparsing fully")
+            file_ids = [loads(line)["instance_id"] for line in file_lines]
+        raw_lines += file_lines
+        instance_ids += file_ids
+    dataset_ids = set(instance_ids)
+    logger.info(f"Loaded {len(raw_lines)} instances from {len(args.dataset)} file(s)")
     front, tail = os.path.splitext(args.dataset[0])
 
     if args.filter_mode == "long_edit":
@@ -105,63 +115,90 @@ def main():
                 "Filter mode 'long_edit' requires trajectory folder(s) via -f/--folder. "
                 "These should be directories containing .pred files (e.g., experiments/traj/)."
             )
+        # Sentinel distinguishing a missing/unreadable .pred (remove) from a
+        # pred that loaded but has an empty model_patch (keep, as before)
+        _LOAD_FAILED = object()
+
+        def _load_patch(pred_path):
+            try:
+                with open(pred_path, "rb") as f:
+                    return loads(f.read())["model_patch"]
+            except Exception:
+                return _LOAD_FAILED
+
         for folder in args.folder:
             logger.info(f"Processing trajectory folder: {folder}")
-            subdirs = os.listdir(folder)
-            for inst_id in tqdm(subdirs):
-                if inst_id not in dataset_ids:
-                    continue
-                patch = None
-                pred_path = os.path.join(folder, inst_id, f"{inst_id}.pred")
-                if not os.path.exists(pred_path):
+            # scandir dirents carry the file type, so is_dir() needs no extra stat
+            with os.scandir(folder) as it:
+                subdir_set = {entry.name for entry in it if entry.is_dir()}
+            # Set intersection scales with the smaller side, so extra
+            # directories in large trajectory folders cost nothing downstream
+            inst_ids = list(dataset_ids & subdir_set)
+            pred_paths = [os.path.join(folder, inst_id, f"{inst_id}.pred") for inst_id in inst_ids]
+            # read() releases the GIL, so threads overlap the thousands of small file reads
+            with ThreadPoolExecutor(max_workers=32) as ex:
+                patches = list(tqdm(ex.map(_load_patch, pred_paths), total=len(pred_paths)))
+            for inst_id, patch in zip(inst_ids, patches):
+                if patch is _LOAD_FAILED:
                     remove_ids.add(inst_id)
-                else:
-                    try:
-                        with open(pred_path, "r") as f:
-                            patch = json.load(f)["model_patch"]
-                    except Exception as e:
-                        remove_ids.add(inst_id)
-                if patch:
+                elif patch:
                     diff_stats = analyze_diff(patch)
-                    if args.filter_mode == "long_edit":
-                        # Mark trajectories with long patches for removal
-                        if diff_stats["added_lines"] + diff_stats["deleted_lines"] > PATCH_EDIT_MAX:
-                            remove_ids.add(inst_id)
+                    # Mark trajectories with long patches for removal
+                    if diff_stats["added_lines"] + diff_stats["deleted_lines"] > PATCH_EDIT_MAX:
+                        remove_ids.add(inst_id)
     elif args.filter_mode == "user_length":
+        from transformers import AutoTokenizer
+
         logger.info("Loading tokenizer (Qwen/Qwen3-8B)...")
-        tokenizer = AutoTokenizer.from_pretrained("Qwen/Qwen3-8B")
+        tokenizer = AutoTokenizer.from_pretrained("Qwen/Qwen3-8B", use_fast=True)
         logger.info("Tokenizer loaded")
         # This is the penultimate message in all SWE-agent trajectories. We do not count this in tool call outputs.
         TARGET_PREFIX = "OBSERVATION:\nThank you for your work on this issue."
-        response_lengths = []
+        # Cheap startswith guard so the full substring scan over tens-of-KB
+        # observation strings only runs on messages that can actually match
+        TARGET_PREFIX_HEAD = "OBSERVATION:\nThank you"
+        # Collect every user message across the dataset up front and tokenize
+        # them in a single batched call; fast tokenizers amortize per-call
+        # overhead massively compared to one encode() per message.
+        # This mode reads message contents, so now materialize the full records
+        loaded_dataset = [loads(line) for line in raw_lines]
+        all_texts = []
+        spans = []
         for data in tqdm(loaded_dataset):
-            cur_lengths = 0
+            start = len(all_texts)
             for msg in data["messages"]:
                 if msg["role"] == "user":
-                    if TARGET_PREFIX in msg["content"]:
+                    content = msg["content"]
+                    if content.startswith(TARGET_PREFIX_HEAD) and TARGET_PREFIX in content:
                         break
-                    cur_lengths += count_tokens(msg["content"])
+                    all_texts.append(content)
+            spans.append((data["instance_id"], len(data["messages"]), start, len(all_texts)))
+        lengths = tokenizer(all_texts, add_special_tokens=False, return_length=True)["length"] if all_texts else []
+        for instance_id, num_messages, start, end in spans:
+            cur_lengths = sum(lengths[start:end])
             # Mark trajectories with average tool call response > TOOL_CALL_TOKEN_MAX for removal
-            if cur_lengths / (len(data["messages"]) // 2) > TOOL_CALL_TOKEN_MAX:
-                remove_ids.add(data["instance_id"])
+            if cur_lengths / (num_messages // 2) > TOOL_CALL_TOKEN_MAX:
+                remove_ids.add(instance_id)
     else:
         raise RuntimeError(
             f"Invalid filter mode: '{args.filter_mode}'. "
             f"Must be one of: 'long_edit' (filter by patch size), 'user_length' (filter by avg tool response tokens)."
         )
 
-    logger.info(f"Flagged {len(remove_ids)} instances for removal ({len(remove_ids)/len(loaded_dataset)*100:.1f}% of dataset)")
+    logger.info(f"Flagged {len(remove_ids)} instances for removal ({len(remove_ids)/len(raw_lines)*100:.1f}% of dataset)")
 
     new_fp = f"{front}_filter_{args.filter_mode}{tail}"
-    kept_data = 0
     if os.path.exists(new_fp):
         raise FileExistsError(f"Output file already exists: {new_fp}. Remove it before running again.")
-    with open(new_fp, "w") as f:
-        for d in loaded_dataset:
-            if d["instance_id"] not in remove_ids:
-                f.write(json.dumps(d) + "\n")
-                kept_data += 1
-    logger.info(f"Filtered dataset: {kept_data} instances ({kept_data/len(loaded_dataset)*100:.1f}% retained)")
+    # Kept records are written back as their original serialized lines, so no
+    # dicts are re-encoded on the way out
+    kept = [line for inst_id, line in zip(instance_ids, raw_lines) if inst_id not in remove_ids]
+    kept_data = len(kept)
+    with open(new_fp, "wb") as f:
+        # Join once and write once instead of a write() syscall per record
+        f.write(b"".join(kept))
+    logger.info(f"Filtered dataset: {kept_data} instances ({kept_data/len(raw_lines)*100:.1f}% retained)")
     logger.info(f"Saved to {new_fp}")
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
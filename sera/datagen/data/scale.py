@@ -26,16 +26,38 @@ Notes:
 """
 
 import argparse
+import heapq
 import json
 import logging
 import os
 import random
 
+from collections import defaultdict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from sera.utils import filter_messages
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+def loads(line):
+    # orjson parses at C level, ~2-5x faster on large JSONL files
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+def dumps_line(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data) + b"\n"
+    return (json.dumps(data) + "\n").encode()
+
 def get_args():
     parser = argparse.ArgumentParser()
     parser.add_argument('-d','--dataset', nargs="+")
@@ -52,14 +74,12 @@ def scale_repos(dataset, number):
     adding all data from one repository at a time until the dataset reaches `number`.
     """
     new_dataset = []
-    repo_to_data = {}
+    repo_to_data = defaultdict(list)
     for data in dataset:
-        repo_name = "_".join(data["instance_id"].split("_"))[:-1]
-        if repo_name not in repo_to_data:
-            repo_to_data[repo_name] = []
+        # Strip the trailing underscore-suffix to recover the repo name
+        repo_name = data["instance_id"].rpartition("_")[0]
         repo_to_data[repo_name].append(data)
-    for repo_name in repo_to_data:
-        logger.info(f"Repository '{repo_name}': {len(repo_to_data[repo_name])} instances")
+    logger.info(f"Grouped {len(dataset)} instances into {len(repo_to_data)} repositories")
     repo_order = list(repo_to_data.keys())
     random.shuffle(repo_order)
     for repo_name in repo_order:
@@ -80,35 +100,63 @@ def scale_tokens(dataset, number, threshold=None):
     """
     logger.info(f"Truncation ratio threshold: {threshold}")
     _, token_to_data_tuples = filter_messages(dataset, truncate=True, return_token_to_data_tuples=True)
-    one_count = 0
     random.shuffle(token_to_data_tuples)
-    for tup in token_to_data_tuples:
-        if tup[0] == 1:
-            one_count += 1
     number = min(number, len(token_to_data_tuples))
-    logger.info(f"Fully included trajectories (ratio=1.0): {one_count}")
-    sorted_token_to_tuples = sorted(token_to_data_tuples, key=lambda x: x[0], reverse=True)
-    logger.info(f"Truncation ratio range: {sorted_token_to_tuples[0][0]:.3f} to {sorted_token_to_tuples[number-1][0]:.3f}")
-    if not threshold:
-        new_dataset = [seq for _, seq in sorted_token_to_tuples][:number]
+    if np is not None:
+        # Vectorized counting, thresholding, and top-k selection; argpartition
+        # is O(N) vs the heap's O(N log number) and avoids per-tuple Python work
+        ratios = np.fromiter((tup[0] for tup in token_to_data_tuples), dtype=np.float64, count=len(token_to_data_tuples))
+        one_count = int((ratios == 1.0).sum())
+        logger.info(f"Fully included trajectories (ratio=1.0): {one_count}")
+        if threshold:
+            logger.info(f"Applying threshold filter: keeping only trajectories with ratio >= {threshold}")
+            keep_idx = np.nonzero(ratios >= threshold)[0]
+        else:
+            keep_idx = np.arange(ratios.size)
+        k = min(number, keep_idx.size)
+        if k < keep_idx.size:
+            keep_idx = keep_idx[np.argpartition(-ratios[keep_idx], k - 1)[:k]]
+        keep_idx = keep_idx[np.argsort(-ratios[keep_idx])]
+        top_tuples = [token_to_data_tuples[i] for i in keep_idx]
+    else:
+        one_count = sum(1 for tup in token_to_data_tuples if tup[0] == 1)
+        logger.info(f"Fully included trajectories (ratio=1.0): {one_count}")
+        if threshold:
+            logger.info(f"Applying threshold filter: keeping only trajectories with ratio >= {threshold}")
+            candidates = [tup for tup in token_to_data_tuples if tup[0] >= threshold]
+        else:
+            candidates = token_to_data_tuples
+        # nlargest is O(N log number) vs O(N log N) for a full sort; only the
+        # top `number` trajectories are ever kept
+        top_tuples = heapq.nlargest(number, candidates, key=lambda x: x[0])
+    if top_tuples:
+        logger.info(f"Truncation ratio range: {top_tuples[0][0]:.3f} to {top_tuples[-1][0]:.3f}")
     else:
-        logger.info(f"Applying threshold filter: keeping only trajectories with ratio >= {threshold}")
-        new_dataset = []
-        for ratio, seq in sorted_token_to_tuples:
-            if ratio >= threshold:
-                new_dataset.append(seq)
-        new_dataset = new_dataset[:number]
+        logger.info("No trajectories meet the selection criteria")
+    new_dataset = [seq for _, seq in top_tuples]
     return new_dataset
 
 def main():
     args = get_args()
     total_ds = []
+    # When records pass through unmodified (no filtering, and tokens mode
+    # truncates) keep each record's original serialized line, keyed by object
+    # identity, so the output write skips re-encoding entirely
+    cache_raw = args.no_filter and args.type != "tokens"
+    raw_by_obj = {}
     for dataset_fp in args.dataset:
-        with open(dataset_fp, "r") as f:
-            ds = [json.loads(line) for line in f.readlines()]
-            if not args.no_filter and not args.type == "tokens": 
-                ds = filter_messages(ds)
-            total_ds += ds
+        with open(dataset_fp, "rb") as f:
+            # Iterate the file handle directly so lines stream instead of
+            # materializing the whole file via readlines()
+            for line in f:
+                data = loads(line)
+                total_ds.append(data)
+                if cache_raw:
+                    raw_by_obj[id(data)] = line if line.endswith(b"\n") else line + b"\n"
+    # One filter pass over the concatenated dataset instead of one per input
+    # file; tokens mode re-filters inside scale_tokens anyway
+    if not args.no_filter and not args.type == "tokens":
+        total_ds = filter_messages(total_ds)
     if args.number > len(total_ds):
         args.number = len(total_ds)
     elif args.number > 0 and args.number < 1:
@@ -141,9 +189,13 @@ def main():
         logger.info(f"Scaled dataset size: {len(scaled_ds)} instances")
         if os.path.exists(fp):
             raise FileExistsError(f"Output file already exists: {fp}. Remove it or specify a different output name with -o.")
-        with open(fp, "w") as f:
-            for data in scaled_ds:
-                f.write(json.dumps(data) + "\n")
+        with open(fp, "wb") as f:
+            # Join once and write once instead of a write() syscall per record
+            if raw_by_obj:
+                f.write(b"".join(raw_by_obj[id(data)] for data in scaled_ds))
+            else:
+                f.write(b"".join(dumps_line(data) for data in scaled_ds))
         logger.info(f"Saved to {fp}")
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
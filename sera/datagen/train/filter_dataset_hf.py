@@ -6,6 +6,7 @@ Drop-in replacement for filter_dataset_tt.py without torchtune dependency.
 import json
 import os
 import copy
+from functools import lru_cache
 from typing import Any, Literal, Optional, Union
 
 from tqdm import tqdm
@@ -125,8 +126,9 @@ class HFTokenizerWrapper:
         return []  # Handled by chat template
 
 
+@lru_cache(maxsize=None)
 def create_hf_tokenizer(tokenizer_name_or_path: str, max_seq_len: Optional[int] = None) -> HFTokenizerWrapper:
-    """Create an HF tokenizer wrapper."""
+    """Create an HF tokenizer wrapper. Cached so repeated filter calls reuse one instance."""
     return HFTokenizerWrapper(tokenizer_name_or_path, max_seq_len)
 
 
@@ -2,6 +2,7 @@ import hydra
 import logging
 import os
 
+from dataclasses import asdict
 from hydra.core.config_store import ConfigStore
 from omegaconf import DictConfig, OmegaConf
 from pathlib import Path
@@ -14,10 +15,9 @@ from sera.config_schema import (
     PostprocessConfig
 )
 from sera.utils import ExperimentFolder, save_yaml, dump_json
-from sera.datagen.data.generate.generate import main as generate_method
-from sera.datagen.data.distill.distill import scrape_synthetic_prs, main as distill_method
-from sera.datagen.data.eval.eval import eval_loop
-from sera.datagen.data.postprocess.postprocess import format_and_save
+
+# Stage implementations are imported lazily inside the _run_* methods; they
+# pull in heavy dependencies that skipped stages should not pay for at startup.
 
 logger = logging.getLogger(__name__)
 
@@ -49,27 +49,35 @@ class Experiment:
             raise ValueError(
                 f"Invalid stage: '{stage}'. Must be one of: {', '.join(self.stage_map.keys())}"
             )
-        OmegaConf.to_container(self.general_cfg, resolve=True)
         self._run_pipeline(self.general_cfg, stage_idx=self.stage_map.get(stage))
 
+    @staticmethod
+    def _log_cfg(cfg) -> None:
+        # Guarded so asdict() only runs when debug logging is actually on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Config:\n%s", asdict(cfg))
+
     def _run_generate(self, cfg: GenerateConfig, skip: bool = False) -> None:
         logger.info("Stage: GENERATE%s", " (skipped)" if skip else "")
-        logger.debug("Config:\n%s", OmegaConf.to_yaml(cfg))
+        self._log_cfg(cfg)
         if not skip:
+            from sera.datagen.data.generate.generate import main as generate_method
             generate_method(config=cfg,
                             metadata_dir=self.general_cfg.metadata_dir, 
                             folder=self.folder)
 
     def _run_distill_one(self, cfg: DistillConfig, skip: bool = False) -> None:
         logger.info("Stage: DISTILL_ONE%s", " (skipped)" if skip else "")
-        logger.debug("Config:\n%s", OmegaConf.to_yaml(cfg))
+        self._log_cfg(cfg)
+        from sera.datagen.data.distill.distill import main as distill_method
         stage_one_output_dir, stage_one_instances_fp = distill_method(config=cfg, folder=self.folder, stage="stage_one", agent_harness=self.general_cfg.agent_harness, metadata_only=skip)
         self.stage_one_output_dir = stage_one_output_dir
         self.stage_one_instances_fp = stage_one_instances_fp
 
     def _run_distill_two(self, cfg: DistillConfig, skip: bool = False) -> None:
         logger.info("Stage: DISTILL_TWO%s", " (skipped)" if skip else "")
-        logger.debug("Config:\n%s", OmegaConf.to_yaml(cfg))
+        self._log_cfg(cfg)
+        from sera.datagen.data.distill.distill import scrape_synthetic_prs, main as distill_method
         stage_two_instances_fp = self.folder.data_dir / "stage_two_instances.yaml"
         if not skip and not stage_two_instances_fp.exists():
             synthetic_pr_instances = scrape_synthetic_prs(self.stage_one_instances_fp, self.stage_one_output_dir, agent_harness=self.general_cfg.agent_harness)
@@ -80,18 +88,20 @@ class Experiment:
 
     def _run_eval(self, cfg: EvalConfig, skip: bool = False) -> None:
         logger.info("Stage: EVAL%s", " (skipped)" if skip else "")
-        logger.debug("Config:\n%s", OmegaConf.to_yaml(cfg))
+        self._log_cfg(cfg)
         report_fp = self.stage_two_output_dir / f"report_t{cfg.compare_patch_threshold}.json"
         if skip:
             self.report_fp = report_fp
             return
+        from sera.datagen.data.eval.eval import eval_loop
         resolved_instances = eval_loop(cfg, instances_fp=self.stage_two_instances_fp, second_stage_dir=self.stage_two_output_dir, agent_harness=self.general_cfg.agent_harness)
         dump_json(report_fp, {"resolved_ids": resolved_instances})
         self.report_fp = report_fp
 
     def _run_postprocess(self, cfg: PostprocessConfig, skip: bool = False) -> None:
         logger.info("Stage: POSTPROCESS%s", " (skipped)" if skip else "")
-        logger.debug("Config:\n%s", OmegaConf.to_yaml(cfg))
+        self._log_cfg(cfg)
+        from sera.datagen.data.postprocess.postprocess import format_and_save
         agent_harness = self.general_cfg.agent_harness
         stage_one_fp = format_and_save(config=cfg, traj_dir=self.stage_one_output_dir, report_path=None, out_dir=self.folder.data_dir, agent_harness=agent_harness)
         stage_two_fp = format_and_save(config=cfg, traj_dir=self.stage_two_output_dir, report_path=self.report_fp, out_dir=self.folder.data_dir, agent_harness=agent_harness)
@@ -116,10 +126,13 @@ def main(cfg: DictConfig) -> None:
     for cfg_name in cfg.sweagent_cfgs:
         expt_folder.add_config(path=os.path.join(cfg.sweagent_cfg_dir, f"{cfg_name}.yaml"))
 
+    # Convert once to a plain SeraConfig; dataclass attribute access avoids
+    # OmegaConf's validated __getattr__ on every read downstream
+    concrete_cfg: SeraConfig = OmegaConf.to_object(cfg)
+
     # Run
-    stage = cfg.get("stage", "pipeline")
-    expt = Experiment(cfg=cfg, folder=expt_folder)
-    expt.run(stage)
+    expt = Experiment(cfg=concrete_cfg, folder=expt_folder)
+    expt.run(concrete_cfg.stage)
 
 if __name__ == "__main__":
     main()